@@ -1,20 +1,116 @@
-from flask import Flask, request, jsonify
+import os
+
+# Enable XLA auto-clustering on CPU (must be set before TensorFlow is imported)
+os.environ.setdefault('TF_XLA_FLAGS', '--tf_xla_auto_jit=2 --tf_xla_cpu_global_jit')
+
+# One intra-op thread per core, shared by all request threads of the process
+os.environ.setdefault('OMP_NUM_THREADS', str(os.cpu_count()))
+os.environ.setdefault('TF_NUM_INTRAOP_THREADS', os.environ['OMP_NUM_THREADS'])
+os.environ.setdefault('TF_NUM_INTEROP_THREADS', '2')
+
+from flask import Flask, Request, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import blake3
+import cachetools
 import numpy as np
+import orjson
+import pybase64
 import tensorflow as tf
 from tensorflow import keras
-from PIL import Image
+from werkzeug.exceptions import RequestEntityTooLarge
+from preprocessing import IMAGE_SIZE, open_image, preprocess_image
 import io
-import base64
+import queue
+import threading
 import time
-import os
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# TensorRT is only available on GPU hosts
+try:
+    import tensorrt as trt
+    import pycuda.driver as cuda
+except ImportError:
+    trt = None
+
+tf.config.threading.set_intra_op_parallelism_threads(int(os.environ['TF_NUM_INTRAOP_THREADS']))
+tf.config.threading.set_inter_op_parallelism_threads(int(os.environ['TF_NUM_INTEROP_THREADS']))
+
+# Grappler rewrites applied to TensorFlow graphs (BN folding, CSE, layout)
+tf.config.optimizer.set_experimental_options({
+    'layout_optimizer': True,
+    'constant_folding': True,
+    'remapping': True
+})
+
+# Uploads are held in memory, so cap their size
+MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', 16))
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    JSON provider backed by orjson, which also serializes numpy
+    scalars and arrays natively
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+class InMemoryRequest(Request):
+    """
+    Request that keeps multipart file uploads in memory instead of
+    Werkzeug's temporary file, which spills uploads over 500 KB to disk,
+    and applies the upload limit to the decoded image size
+    """
+
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        return io.BytesIO()
+
+    @property
+    def max_content_length(self):
+        # MAX_CONTENT_LENGTH caps the whole body; base64 inflates the image
+        # by 4/3, so size JSON bodies to still fit a MAX_UPLOAD_MB image
+        limit = super().max_content_length
+        if limit is not None and self.is_json:
+            return limit * 4 // 3 + 4096
+        return limit
+
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+app.request_class = InMemoryRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
 CORS(app)  # Enable CORS for React/Next.js frontend
 
 # Configuration
 MODEL_PATH = 'best_90plus_model.h5'
-IMAGE_SIZE = (299, 299)
+ONNX_MODEL_PATH = os.environ.get('ONNX_MODEL_PATH', 'model.onnx')
+ONNX_INT8_MODEL_PATH = os.environ.get('ONNX_INT8_MODEL_PATH', 'model_int8.onnx')
+SAVED_MODEL_DIR = os.environ.get('SAVED_MODEL_DIR', 'saved_model')
+TRT_ENGINE_PATH = os.environ.get('TRT_ENGINE_PATH', 'incv3_fp16.engine')
+TFLITE_MODEL_PATH = os.environ.get('TFLITE_MODEL_PATH', 'model.tflite')
+MIXED_PRECISION = os.environ.get('MIXED_PRECISION', '0') == '1'
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 1024))
+
+# Number of gunicorn workers (see Procfile); TFLite is only worth its
+# slower kernels when several workers share its weights
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Backend to serve; 'auto' picks the fastest export present
+REQUESTED_BACKEND = os.environ.get('MODEL_BACKEND', 'auto')
+BACKENDS = (
+    'auto', 'tensorrt', 'tflite', 'onnxruntime-int8',
+    'onnxruntime', 'savedmodel', 'keras'
+)
 
 # Class names in order
 CLASS_NAMES = [
@@ -22,44 +118,500 @@ CLASS_NAMES = [
     'laterite', 'peat', 'red', 'sandy', 'yellow'
 ]
 
+# Micro-batching (mirrors TF-Serving's max_batch_size / batch_timeout_micros)
+MAX_BATCH = int(os.environ.get('MAX_BATCH', 8))
+BATCH_TIMEOUT_MS = float(os.environ.get('BATCH_TIMEOUT_MS', 5))
+
+# Batches are padded up to one of these sizes (like TF-Serving's
+# allowed_batch_sizes), so XLA compiles a few shapes instead of one per size
+ALLOWED_BATCH_SIZES = sorted(
+    {2 ** i for i in range(MAX_BATCH.bit_length()) if 2 ** i < MAX_BATCH} | {MAX_BATCH}
+)
+
+# Longest a request waits for the batch worker before giving up
+INFERENCE_TIMEOUT_S = float(os.environ.get('INFERENCE_TIMEOUT_S', 30))
+
+
+class InferenceTimeoutError(RuntimeError):
+    """
+    Raised when a queued request gets no prediction in time
+    """
+
+
+def top1(probabilities):
+    """
+    Append the top-1 class index and confidence to a batch of
+    probabilities (works on both NumPy arrays and TensorFlow tensors)
+    Returns (probabilities, indices, confidences)
+    """
+    if isinstance(probabilities, np.ndarray):
+        return probabilities, probabilities.argmax(axis=-1), probabilities.max(axis=-1)
+    return (
+        probabilities,
+        tf.argmax(probabilities, axis=-1, output_type=tf.int32),
+        tf.reduce_max(probabilities, axis=-1)
+    )
+
+
+def load_onnx_session(path):
+    """
+    Create an ONNX Runtime session on the CPU execution provider
+    with all graph optimizations enabled
+    """
+    so = ort.SessionOptions()
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    so.intra_op_num_threads = int(os.environ['TF_NUM_INTRAOP_THREADS'])
+    return ort.InferenceSession(path, sess_options=so, providers=['CPUExecutionProvider'])
+
+
+def make_onnx_infer(session):
+    """
+    Build an inference function for an ONNX Runtime session
+    - Output is written into a pre-allocated per-thread buffer sized for
+      MAX_BATCH; the returned probabilities are only valid until the next call
+    """
+    input_name = session.get_inputs()[0].name
+    output_name = session.get_outputs()[0].name
+    local = threading.local()
+
+    def infer(x):
+        if not hasattr(local, 'binding'):
+            local.output = np.empty((MAX_BATCH, len(CLASS_NAMES)), dtype=np.float32)
+            local.binding = session.io_binding()
+
+        output = local.output[:len(x)]
+        local.binding.bind_cpu_input(input_name, x)
+        local.binding.bind_output(
+            output_name, 'cpu', 0, np.float32,
+            output.shape, output.ctypes.data
+        )
+        session.run_with_iobinding(local.binding)
+        return top1(output)
+
+    return infer
+
+
+def set_layer_policy(layer_configs, policy):
+    """
+    Set the dtype policy of every layer in a Keras model config,
+    including layers of nested models
+    """
+    for layer in layer_configs:
+        if layer['class_name'] == 'InputLayer':
+            continue
+        layer['config']['dtype'] = policy
+        if 'layers' in layer['config']:
+            set_layer_policy(layer['config']['layers'], policy)
+
+
+def to_mixed_precision(model):
+    """
+    Rebuild a Keras model with the mixed_float16 policy
+    - Conv/matmul compute and activations in FP16; weights are reused
+    - The saved config pins each layer to float32, so the global policy
+      alone has no effect on a loaded model
+    - The output layer stays float32 to keep probabilities precise
+    """
+    config = model.get_config()
+    set_layer_policy(config['layers'], 'mixed_float16')
+    config['layers'][-1]['config']['dtype'] = 'float32'
+
+    mixed_model = model.__class__.from_config(config)
+    mixed_model.set_weights(model.get_weights())
+    return mixed_model
+
+
+def make_keras_infer(model):
+    """
+    Build an inference function for a Keras model
+    - Compiled with XLA; the input signature avoids retracing, and XLA
+      compiles once per batch size seen
+    - Top-1 selection is fused into the compiled graph
+    """
+    xla_infer = tf.function(
+        lambda x: top1(model(x, training=False)),
+        jit_compile=True,
+        input_signature=[tf.TensorSpec((None, *IMAGE_SIZE, 3), tf.float32)]
+    )
+    return lambda x: tuple(t.numpy() for t in xla_infer(tf.constant(x)))
+
+
+def make_saved_model_infer(saved_model):
+    """
+    Build an inference function for the exported SavedModel's
+    serving signature (graph already frozen and optimized by Grappler)
+    - Compiled with XLA like the Keras path, once per batch size seen
+    - Top-1 selection runs in the same graph
+    """
+    serving_fn = saved_model.signatures['serving_default']
+    input_name = list(serving_fn.structured_input_signature[1])[0]
+    output_name = list(serving_fn.structured_outputs)[0]
+    graph_infer = tf.function(
+        lambda x: top1(serving_fn(**{input_name: x})[output_name]),
+        jit_compile=True,
+        input_signature=[tf.TensorSpec((None, *IMAGE_SIZE, 3), tf.float32)]
+    )
+    return lambda x: tuple(t.numpy() for t in graph_infer(tf.constant(x)))
+
+
+def load_tensorrt_engine(path, cuda_context):
+    """
+    Deserialize a TensorRT engine built from the ONNX export
+    """
+    cuda_context.push()
+    try:
+        with open(path, 'rb') as f, trt.Runtime(trt.Logger(trt.Logger.WARNING)) as runtime:
+            return runtime.deserialize_cuda_engine(f.read())
+    finally:
+        cuda_context.pop()
+
+
+def make_tensorrt_infer(engine, cuda_context):
+    """
+    Build an inference function for a TensorRT engine
+    - One execution context on a dedicated CUDA stream
+    - Pinned host and device buffers sized for MAX_BATCH, allocated once;
+      the returned probabilities are only valid until the next call
+    """
+    cuda_context.push()
+    try:
+        context = engine.create_execution_context()
+        stream = cuda.Stream()
+        host_input = cuda.pagelocked_empty((MAX_BATCH, *IMAGE_SIZE, 3), np.float32)
+        host_output = cuda.pagelocked_empty((MAX_BATCH, len(CLASS_NAMES)), np.float32)
+        device_input = cuda.mem_alloc(host_input.nbytes)
+        device_output = cuda.mem_alloc(host_output.nbytes)
+    finally:
+        cuda_context.pop()
+
+    input_name, output_name = engine.get_tensor_name(0), engine.get_tensor_name(1)
+    context.set_tensor_address(input_name, int(device_input))
+    context.set_tensor_address(output_name, int(device_output))
+    lock = threading.Lock()
+
+    def infer(x):
+        batch_size = len(x)
+        with lock:
+            # The CUDA context is current per thread; push it for the caller
+            cuda_context.push()
+            try:
+                host_input[:batch_size] = x
+                context.set_input_shape(input_name, x.shape)
+                cuda.memcpy_htod_async(device_input, host_input[:batch_size], stream)
+                context.execute_async_v3(stream.handle)
+                cuda.memcpy_dtoh_async(host_output[:batch_size], device_output, stream)
+                stream.synchronize()
+            finally:
+                cuda_context.pop()
+            return top1(host_output[:batch_size])
+
+    return infer
+
+
+def load_tflite_interpreter(path):
+    """
+    Create a TFLite interpreter for the exported flatbuffer
+    - The file is memory-mapped, so gunicorn workers loading the same
+      model share its weight pages through the OS page cache
+    - Default delegates are disabled: XNNPACK repacks weights into
+      private per-process memory, which would undo the sharing
+    - Single-threaded: with num_threads > 1 the builtin multithreaded
+      conv kernel copies every filter into private memory on the first
+      invoke(), so parallelism comes from the number of workers instead
+    - The builtin kernels are slower, so this backend is only picked
+      for multi-worker deploys
+    - Check the sharing with the memory line logged after boot: anonymous
+      memory should not grow by the size of the .tflite file
+    """
+    return tf.lite.Interpreter(
+        model_path=path,
+        num_threads=1,
+        experimental_op_resolver_type=tf.lite.experimental.OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+    )
+
+
+def make_tflite_infer(interpreter):
+    """
+    Build an inference function for a TFLite interpreter
+    - Tensors are re-allocated only when the batch size changes
+    """
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+    allocated_shape = [None]
+    lock = threading.Lock()
+
+    def infer(x):
+        with lock:
+            if allocated_shape[0] != x.shape:
+                interpreter.resize_tensor_input(input_index, x.shape)
+                interpreter.allocate_tensors()
+                allocated_shape[0] = x.shape
+
+            interpreter.set_tensor(input_index, x)
+            interpreter.invoke()
+            return top1(interpreter.get_tensor(output_index))
+
+    return infer
+
+
+def find_missing(path, package_available=True, package=None):
+    """
+    Return what a backend lacks (its package, then its export file),
+    or None when it can be loaded
+    """
+    if not package_available:
+        return f"package {package}"
+    if not os.path.exists(path):
+        return path
+    return None
+
+
+def use_backend(backend, missing, preferred=True):
+    """
+    Whether load_model should pick a backend: the one named by
+    MODEL_BACKEND, or in auto mode the first preferred one with nothing
+    missing
+    - Raises RuntimeError when MODEL_BACKEND forces a backend that is
+      missing its package or export
+    """
+    if REQUESTED_BACKEND == 'auto':
+        return preferred and missing is None
+    if REQUESTED_BACKEND != backend:
+        return False
+    if missing is not None:
+        raise RuntimeError(f"MODEL_BACKEND={backend} requested but {missing} is not available")
+    return True
+
+
+def load_model():
+    """
+    Load the backend named by MODEL_BACKEND, or the fastest available
+    one in auto mode
+    - TensorRT when running on a GPU host with a built engine
+    - TFLite when exported and WEB_CONCURRENCY > 1, to share weights
+      across gunicorn workers
+    - ONNX Runtime (INT8, then FP32) when an export exists
+    - Then the SavedModel export, then the Keras model with XLA
+      (in mixed precision if MIXED_PRECISION is set)
+    Returns (model, infer, backend name)
+    """
+    if REQUESTED_BACKEND not in BACKENDS:
+        raise ValueError(f"Unknown MODEL_BACKEND {REQUESTED_BACKEND!r}, expected one of {BACKENDS}")
+
+    if use_backend('tensorrt', find_missing(TRT_ENGINE_PATH, trt is not None, 'tensorrt/pycuda')):
+        cuda.init()
+        cuda_context = cuda.Device(0).retain_primary_context()
+        engine = load_tensorrt_engine(TRT_ENGINE_PATH, cuda_context)
+        return engine, make_tensorrt_infer(engine, cuda_context), 'tensorrt'
+
+    if use_backend('tflite', find_missing(TFLITE_MODEL_PATH), preferred=WEB_CONCURRENCY > 1):
+        interpreter = load_tflite_interpreter(TFLITE_MODEL_PATH)
+        return interpreter, make_tflite_infer(interpreter), 'tflite'
+
+    onnx_models = [
+        (ONNX_INT8_MODEL_PATH, 'onnxruntime-int8'),
+        (ONNX_MODEL_PATH, 'onnxruntime')
+    ]
+    for path, backend in onnx_models:
+        if use_backend(backend, find_missing(path, ort is not None, 'onnxruntime')):
+            session = load_onnx_session(path)
+            return session, make_onnx_infer(session), backend
+
+    if use_backend('savedmodel', find_missing(SAVED_MODEL_DIR)):
+        saved_model = tf.saved_model.load(SAVED_MODEL_DIR)
+        return saved_model, make_saved_model_infer(saved_model), 'savedmodel'
+
+    if MIXED_PRECISION:
+        keras.mixed_precision.set_global_policy('mixed_float16')
+        keras_model = to_mixed_precision(keras.models.load_model(MODEL_PATH))
+        return keras_model, make_keras_infer(keras_model), 'keras-fp16'
+
+    keras_model = keras.models.load_model(MODEL_PATH)
+    return keras_model, make_keras_infer(keras_model), 'keras'
+
+
+def warm_up(infer):
+    """
+    Run a dummy batch of every size in ALLOWED_BATCH_SIZES, the only
+    sizes the batch worker produces
+    - Pays kernel initialization (and XLA compilation, which happens
+      once per batch size) at boot instead of on the first requests
+    - Failures are logged and never stop the server from starting
+    """
+    start_time = time.time()
+    for batch_size in ALLOWED_BATCH_SIZES:
+        try:
+            infer(np.zeros((batch_size, *IMAGE_SIZE, 3), dtype=np.float32))
+        except Exception as e:
+            print(f"Warmup failed at batch size {batch_size}: {e}")
+            return
+
+    print(f"Warmup done in {time.time() - start_time:.1f}s")
+
+
+def memory_usage_mb():
+    """
+    Read this process's memory from /proc/self/smaps_rollup (Linux)
+    - rss: resident memory, including mapped files such as model.tflite
+    - pss: resident memory with shared pages split across processes
+    - anonymous: private heap memory, where copied weights would end up
+    Returns a dict of MB values, or None when unavailable
+    """
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            fields = dict(line.split(':', 1) for line in f if line.endswith('kB\n'))
+    except OSError:
+        return None
+
+    return {
+        name: int(fields[key].split()[0]) / 1024
+        for name, key in (('rss', 'Rss'), ('pss', 'Pss'), ('anonymous', 'Anonymous'))
+    }
+
+
 # Load model
 print("Loading model...")
+boot_start_time = time.time()
 try:
-    model = keras.models.load_model(MODEL_PATH)
-    print("Model loaded successfully!")
+    model, infer, MODEL_BACKEND = load_model()
+    print(f"Model loaded successfully in {time.time() - boot_start_time:.1f}s! (backend: {MODEL_BACKEND})")
+    if MIXED_PRECISION and MODEL_BACKEND != 'keras-fp16':
+        print(f"Warning: MIXED_PRECISION only applies to the Keras model, ignored by backend {MODEL_BACKEND}")
 except Exception as e:
     print(f"Error loading model: {e}")
     model = None
+    infer = None
+    MODEL_BACKEND = None
+
+if infer is not None:
+    warm_up(infer)
+    # Must stay well below gunicorn's --timeout, or the worker is killed while booting
+    print(f"Boot done in {time.time() - boot_start_time:.1f}s")
+
+    memory = memory_usage_mb()
+    if memory is not None:
+        print(
+            f"Memory: {memory['rss']:.0f} MB resident, {memory['pss']:.0f} MB proportional, "
+            f"{memory['anonymous']:.0f} MB anonymous"
+        )
+
+# Shared, pre-allocated input slots. Requests preprocess straight into a
+# slot and the batch worker reads batches from them without re-stacking.
+# Twice MAX_BATCH lets the next batch be prepared while one is running;
+# a burst beyond that blocks on a free slot. Zero-filled so padding rows
+# never hold NaNs or denormals.
+INPUT_SLOTS = MAX_BATCH * 2
+input_slots = np.zeros((INPUT_SLOTS, *IMAGE_SIZE, 3), dtype=np.float32)
+batch_buffer = np.zeros((MAX_BATCH, *IMAGE_SIZE, 3), dtype=np.float32)
+
+# Lowest free slot first, so concurrent requests tend to get adjacent slots
+free_input_slots = queue.PriorityQueue()
+for slot in range(INPUT_SLOTS):
+    free_input_slots.put(slot)
+
+batch_queue = queue.Queue()
+
+
+def padded_batch_size(size):
+    """
+    Return the smallest allowed batch size that fits size requests
+    """
+    return next(allowed for allowed in ALLOWED_BATCH_SIZES if allowed >= size)
 
 
-def preprocess_image(image):
+def gather_batch(slots, batch_size):
     """
-    Preprocess image for InceptionV3 model
-    - Resize to 299x299
-    - Apply InceptionV3 preprocessing
+    Return an input batch of batch_size rows for the given sorted slot
+    indices; rows past len(slots) are padding and their outputs are ignored
+    - A contiguous run of slots is a zero-copy view of input_slots,
+      padded with whatever the following slots hold
+    - Otherwise the slots are gathered into batch_buffer (one copy)
     """
-    # Resize image
-    image = image.resize(IMAGE_SIZE)
+    first = slots[0]
+    if slots[-1] - first == len(slots) - 1 and first + batch_size <= INPUT_SLOTS:
+        return input_slots[first:first + batch_size]
 
-    # Convert to array
-    img_array = np.array(image)
+    batch = batch_buffer[:batch_size]
+    np.take(input_slots, slots, axis=0, out=batch[:len(slots)])
+    return batch
 
-    # Ensure RGB (convert RGBA to RGB if needed)
-    if img_array.shape[-1] == 4:
-        img_array = img_array[:, :, :3]
 
-    # Add batch dimension
-    img_array = np.expand_dims(img_array, axis=0)
+def batch_worker():
+    """
+    Run queued requests through the model in batches
+    - Collects up to MAX_BATCH requests, waiting at most BATCH_TIMEOUT_MS
+      after the first one arrives
+    - Pads each batch up to the next size in ALLOWED_BATCH_SIZES
+    """
+    while True:
+        batch = [batch_queue.get()]
+
+        # Every failure is reported to the waiting requests; the worker
+        # itself must never die, or all later requests would time out
+        try:
+            deadline = time.monotonic() + BATCH_TIMEOUT_MS / 1000
+
+            while len(batch) < MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(batch_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Order by slot so adjacent slots form a single view
+            batch.sort(key=lambda item: item['slot'])
+
+            slots = [item['slot'] for item in batch]
+            images = gather_batch(slots, padded_batch_size(len(slots)))
+            probabilities, indices, confidences = infer(images)
+            # Copy out of the backend's reusable output buffer
+            probabilities = np.array(probabilities)
+
+            for item, prediction in zip(batch, zip(probabilities, indices.tolist(), confidences)):
+                item['result'] = prediction
+        except Exception as e:
+            for item in batch:
+                item['error'] = e
+        finally:
+            for item in batch:
+                item['done'].set()
+
+
+def run_inference(slot):
+    """
+    Submit a preprocessed input slot to the batch worker and wait for
+    its prediction
+    Returns (class probabilities, top-1 index, top-1 confidence)
+    """
+    item = {
+        'slot': slot,
+        'done': threading.Event(),
+        'result': None,
+        'error': None
+    }
+    batch_queue.put(item)
+    if not item['done'].wait(INFERENCE_TIMEOUT_S):
+        raise InferenceTimeoutError(f"Inference timed out after {INFERENCE_TIMEOUT_S:g}s")
+
+    if item['error'] is not None:
+        raise item['error']
+    return item['result']
 
-    # Apply InceptionV3 preprocessing
-    img_array = tf.keras.applications.inception_v3.preprocess_input(img_array)
 
-    return img_array
+if infer is not None:
+    threading.Thread(target=batch_worker, name='batch-worker', daemon=True).start()
 
+# Predictions keyed by the BLAKE3 hash of the raw image bytes
+prediction_cache = cachetools.LRUCache(maxsize=PREDICTION_CACHE_SIZE)
+prediction_cache_lock = threading.Lock()
 
-def decode_image_from_request(request_data):
+
+def read_image_bytes_from_request(request_data):
     """
-    Decode image from request (supports file upload and base64)
+    Read the raw (encoded) image bytes from request
+    (supports file upload and base64)
     """
     # Check if file upload
     if 'file' in request.files:
@@ -67,8 +619,7 @@ def decode_image_from_request(request_data):
         if file.filename == '':
             raise ValueError("No file selected")
 
-        image = Image.open(file.stream)
-        return image
+        return file.read()
 
     # Check if JSON with base64 image
     elif request.is_json:
@@ -76,16 +627,14 @@ def decode_image_from_request(request_data):
 
         if 'image' in data:
             # Handle base64 encoded image
-            image_data = data['image']
+            image_data = data['image'].encode('ascii')
 
-            # Remove data URL prefix if present
-            if 'base64,' in image_data:
-                image_data = image_data.split('base64,')[1]
+            # Skip data URL prefix if present (base64 never contains a
+            # comma); the memoryview avoids copying the payload
+            payload = memoryview(image_data)[image_data.find(b',') + 1:]
 
-            # Decode base64
-            image_bytes = base64.b64decode(image_data)
-            image = Image.open(io.BytesIO(image_bytes))
-            return image
+            # Decode base64 (SIMD)
+            return pybase64.b64decode(payload, validate=False)
         else:
             raise ValueError("No 'image' field in JSON request")
 
@@ -136,6 +685,7 @@ def model_info():
         "num_classes": len(CLASS_NAMES),
         "classes": CLASS_NAMES,
         "preprocessing": "InceptionV3 preprocessing function",
+        "backend": MODEL_BACKEND,
         "model_loaded": model is not None
     })
 
@@ -151,46 +701,80 @@ def predict():
     start_time = time.time()
 
     try:
-        # Decode image from request
-        image = decode_image_from_request(request)
-
-        # Preprocess image
-        processed_image = preprocess_image(image)
-
-        # Make prediction
-        predictions = model.predict(processed_image, verbose=0)
+        # Read image bytes from request
+        image_bytes = read_image_bytes_from_request(request)
+
+        # Short-circuit repeated images (pass ?nocache=1 to bypass)
+        use_cache = request.args.get('nocache') != '1'
+        if use_cache:
+            cache_key = blake3.blake3(image_bytes).digest()
+            with prediction_cache_lock:
+                cached_prediction = prediction_cache.get(cache_key)
+
+            if cached_prediction is not None:
+                return jsonify({
+                    "success": True,
+                    "prediction": cached_prediction,
+                    "cached": True,
+                    "processing_time": round(time.time() - start_time, 3)
+                })
+
+        # Decode image
+        image = open_image(io.BytesIO(image_bytes))
+
+        # Preprocess image into a free input slot and make prediction
+        slot = free_input_slots.get()
+        try:
+            preprocess_image(image, input_slots[slot])
+            predictions, predicted_index, confidence = run_inference(slot)
+        finally:
+            free_input_slots.put(slot)
 
         # Get predicted class
-        predicted_index = int(np.argmax(predictions[0]))
         predicted_class = CLASS_NAMES[predicted_index]
-        confidence = float(predictions[0][predicted_index])
 
-        # Create probabilities dictionary
-        probabilities = {
-            CLASS_NAMES[i]: float(predictions[0][i])
-            for i in range(len(CLASS_NAMES))
+        # Create probabilities dictionary (numpy floats, serialized by orjson)
+        probabilities = dict(zip(CLASS_NAMES, predictions))
+
+        prediction = {
+            "class": predicted_class,
+            "class_index": predicted_index,
+            "confidence": confidence,
+            "probabilities": probabilities
         }
 
+        if use_cache:
+            with prediction_cache_lock:
+                prediction_cache[cache_key] = prediction
+
         # Calculate processing time
         processing_time = time.time() - start_time
 
         return jsonify({
             "success": True,
-            "prediction": {
-                "class": predicted_class,
-                "class_index": predicted_index,
-                "confidence": confidence,
-                "probabilities": probabilities
-            },
+            "prediction": prediction,
+            "cached": False,
             "processing_time": round(processing_time, 3)
         })
 
+    except RequestEntityTooLarge:
+        return jsonify({
+            "success": False,
+            "error": f"Image too large (max {MAX_UPLOAD_MB} MB)"
+        }), 413
+
     except ValueError as e:
         return jsonify({
             "success": False,
             "error": str(e)
         }), 400
 
+    except InferenceTimeoutError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 503
+
     except Exception as e:
         return jsonify({
             "success": False,
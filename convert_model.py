@@ -0,0 +1,189 @@
+"""
+Convert the Keras model into optimized inference formats
+- model.onnx: ONNX export served by ONNX Runtime
+- model_int8.onnx: static INT8 quantization of the ONNX export
+- saved_model/: SavedModel with a frozen serving signature
+- incv3_fp16.engine: TensorRT FP16 engine (GPU hosts, needs trtexec)
+- model.tflite: TFLite flatbuffer, memory-mapped and shared by workers
+
+Run once after pulling the model:
+    python convert_model.py
+    python convert_model.py --calibration-dir path/to/soil/images
+    python convert_model.py --tensorrt
+    python convert_model.py --saved-model
+    python convert_model.py --tflite
+"""
+import argparse
+import glob
+import os
+import random
+import subprocess
+
+import numpy as np
+import onnx
+import tensorflow as tf
+from tensorflow import keras
+import tf2onnx
+from onnxruntime.quantization import (
+    CalibrationDataReader, QuantFormat, QuantType, quantize_static
+)
+
+from preprocessing import IMAGE_SIZE, open_image, preprocess_image
+
+# Configuration
+MODEL_PATH = 'best_90plus_model.h5'
+ONNX_MODEL_PATH = 'model.onnx'
+ONNX_INT8_MODEL_PATH = 'model_int8.onnx'
+SAVED_MODEL_DIR = 'saved_model'
+TRT_ENGINE_PATH = 'incv3_fp16.engine'
+TFLITE_MODEL_PATH = 'model.tflite'
+ONNX_OPSET = 17
+CALIBRATION_SIZE = 100
+TRT_OPT_BATCH = 8
+TRT_MAX_BATCH = 16
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+def load_calibration_image(path):
+    """
+    Load an image with the same preprocessing as the API
+    (JPEG draft decode, INTER_AREA resize, InceptionV3 scaling)
+    """
+    img_array = np.empty((1, *IMAGE_SIZE, 3), dtype=np.float32)
+    preprocess_image(open_image(path), img_array[0])
+    return img_array
+
+
+class SoilCalibrationDataReader(CalibrationDataReader):
+    """
+    Feed a random sample of preprocessed soil images to the calibrator
+    """
+
+    def __init__(self, image_dir, input_name, limit=CALIBRATION_SIZE):
+        paths = [
+            path for path in glob.glob(os.path.join(image_dir, '**', '*'), recursive=True)
+            if path.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+        if not paths:
+            raise ValueError(f"No calibration images found in {image_dir}")
+
+        paths = random.Random(0).sample(sorted(paths), min(limit, len(paths)))
+        self.input_name = input_name
+        self.paths = iter(paths)
+
+    def get_next(self):
+        path = next(self.paths, None)
+        if path is None:
+            return None
+        return {self.input_name: load_calibration_image(path)}
+
+
+def export_onnx(model, output_path=ONNX_MODEL_PATH):
+    """
+    Export the Keras model to ONNX with a dynamic batch dimension
+    """
+    input_signature = [tf.TensorSpec((None, *IMAGE_SIZE, 3), tf.float32, name='input')]
+    tf2onnx.convert.from_keras(
+        model,
+        input_signature=input_signature,
+        opset=ONNX_OPSET,
+        output_path=output_path
+    )
+    print(f"Saved ONNX model to {output_path}")
+
+
+def export_saved_model(model, output_dir=SAVED_MODEL_DIR):
+    """
+    Export the Keras model as a SavedModel with a concrete serving
+    signature, so the graph is traced once and loads without Keras
+    layer dispatch
+    """
+    serve = tf.function(lambda x: model(x, training=False))
+    concrete_fn = serve.get_concrete_function(
+        tf.TensorSpec((None, *IMAGE_SIZE, 3), tf.float32, name='input')
+    )
+    tf.saved_model.save(model, output_dir, signatures={'serving_default': concrete_fn})
+    print(f"Saved SavedModel to {output_dir}")
+
+
+def export_tflite(model, output_path=TFLITE_MODEL_PATH):
+    """
+    Export the Keras model to a TFLite flatbuffer (FP32 weights, so
+    they can be used in place from the memory-mapped file)
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    with open(output_path, 'wb') as f:
+        f.write(converter.convert())
+    print(f"Saved TFLite model to {output_path}")
+
+
+def quantize_onnx(calibration_dir, input_path=ONNX_MODEL_PATH,
+                  output_path=ONNX_INT8_MODEL_PATH, vnni=True):
+    """
+    Statically quantize the ONNX model to INT8
+    - Per-channel QInt8 weights, calibrated QUInt8 activations
+    - QDQ format for VNNI CPUs; QOperator (QLinearConv) with reduced
+      range otherwise, which avoids u8s8 saturation in AVX2 kernels
+    """
+    input_name = onnx.load(input_path).graph.input[0].name
+    quantize_static(
+        input_path,
+        output_path,
+        SoilCalibrationDataReader(calibration_dir, input_name),
+        quant_format=QuantFormat.QDQ if vnni else QuantFormat.QOperator,
+        per_channel=True,
+        reduce_range=not vnni,
+        weight_type=QuantType.QInt8,
+        activation_type=QuantType.QUInt8
+    )
+    print(f"Saved INT8 model to {output_path}")
+
+
+def build_tensorrt_engine(input_path=ONNX_MODEL_PATH, output_path=TRT_ENGINE_PATH):
+    """
+    Build an FP16 TensorRT engine from the ONNX model with trtexec
+    - Dynamic batch from 1 to TRT_MAX_BATCH, tuned for TRT_OPT_BATCH
+    """
+    shape = 'x'.join(str(dim) for dim in (*IMAGE_SIZE, 3))
+    subprocess.run([
+        'trtexec',
+        f'--onnx={input_path}',
+        f'--saveEngine={output_path}',
+        '--fp16',
+        '--memPoolSize=workspace:2048',
+        f'--minShapes=input:1x{shape}',
+        f'--optShapes=input:{TRT_OPT_BATCH}x{shape}',
+        f'--maxShapes=input:{TRT_MAX_BATCH}x{shape}'
+    ], check=True)
+    print(f"Saved TensorRT engine to {output_path}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert the soil classification model")
+    parser.add_argument('--calibration-dir',
+                        help="Directory of soil images; enables INT8 quantization")
+    parser.add_argument('--no-vnni', action='store_true',
+                        help="Target CPUs without AVX512-VNNI/AVX-VNNI")
+    parser.add_argument('--saved-model', action='store_true',
+                        help="Also export a SavedModel (serve with MODEL_BACKEND=savedmodel)")
+    parser.add_argument('--tensorrt', action='store_true',
+                        help="Also build a TensorRT FP16 engine (requires trtexec)")
+    parser.add_argument('--tflite', action='store_true',
+                        help="Also export a TFLite model for multi-worker deployments")
+    args = parser.parse_args()
+
+    print("Loading model...")
+    model = keras.models.load_model(MODEL_PATH)
+    export_onnx(model)
+
+    if args.saved_model:
+        export_saved_model(model)
+
+    if args.calibration_dir:
+        quantize_onnx(args.calibration_dir, vnni=not args.no_vnni)
+
+    if args.tensorrt:
+        build_tensorrt_engine()
+
+    if args.tflite:
+        export_tflite(model)
@@ -0,0 +1,64 @@
+"""
+Image decoding and preprocessing shared by the API and the model
+converter, so INT8 calibration sees exactly what is served
+"""
+import cv2
+import numpy as np
+from PIL import Image
+
+IMAGE_SIZE = (299, 299)
+
+# JPEG decode target; resize finishes from here to IMAGE_SIZE
+DRAFT_SIZE = (IMAGE_SIZE[0] * 2, IMAGE_SIZE[1] * 2)
+
+# InceptionV3 preprocessing maps [0, 255] to [-1, 1]
+PIXEL_SCALE = np.float32(2.0 / 255.0)
+PIXEL_OFFSET = np.float32(1.0)
+
+
+def preprocess_image(image, out):
+    """
+    Preprocess image for InceptionV3 model
+    - Resize to 299x299
+    - Apply InceptionV3 preprocessing
+    - Writes into out, a (299, 299, 3) float32 input slot
+    """
+    # Ensure RGB (convert RGBA, grayscale, palette, ... in PIL)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # Convert to array (one uint8 copy of the decoded image via tobytes())
+    img_array = np.asarray(image, dtype=np.uint8)
+
+    # Resize image (OpenCV's SIMD area filter)
+    img_array = cv2.resize(img_array, IMAGE_SIZE, interpolation=cv2.INTER_AREA)
+
+    # Reject anything that does not fit the slot here, so one bad image
+    # fails only its own request and never the batch it would join
+    if img_array.shape != out.shape:
+        raise ValueError(f"Unsupported image shape {img_array.shape}")
+
+    # Apply InceptionV3 preprocessing (x / 127.5 - 1) in place in the
+    # slot; uint8 is converted to float32 inside the multiply, so no
+    # float copy of the image is ever made
+    np.multiply(img_array, PIXEL_SCALE, out=out)
+    np.subtract(out, PIXEL_OFFSET, out=out)
+
+    return out
+
+
+def open_image(stream):
+    """
+    Open and fully decode an image
+    - For JPEGs larger than DRAFT_SIZE, libjpeg-turbo's IDCT scales by
+      1/2, 1/4 or 1/8 to the smallest size still >= DRAFT_SIZE; other
+      images are decoded as-is
+    """
+    try:
+        image = Image.open(stream)
+        image.draft('RGB', DRAFT_SIZE)
+        image.load()
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError("Invalid or unsupported image file") from e
+
+    return image